@@ -0,0 +1,438 @@
+"""Offline OCR of recorded video files.
+
+Splits the video into frame ranges that are decoded and OCR'd in parallel
+worker processes, then writes a (frame, video time, value) series to CSV or
+Excel.
+
+Example:
+    python batch_processing.py recording.mp4 --roi 120,80,200,60 --stride 5
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+import config
+from image_processing import (
+    ROI_Quad,
+    get_rectify_maps,
+    is_valid_quad,
+    order_quad,
+    process_image,
+    quad_bounding_rect,
+    rectify_roi,
+)
+from ocr import perform_ocr, setup_tesseract
+from quality_gate import (
+    QualityThresholds, check_quality, thresholds_from_reference
+)
+from excel_logging import SERIES_HEADER_ROW, write_series_to_excel
+
+
+# --- Constants ---
+MS_PER_SECOND = 1000.0
+EXCEL_EXTENSION = ".xlsx"
+
+# --- Type Aliases ---
+Reading = tuple[int, float, str]
+
+
+def parse_int_list(text: str, count: int) -> tuple[int, ...]:
+    """Parses a comma separated list of exactly 'count' integers.
+
+    Args:
+        text (str): Input such as "10,20,30,40".
+        count (int): Required number of values.
+
+    Returns:
+        tuple[int, ...]: Parsed integers.
+
+    Raises:
+        argparse.ArgumentTypeError: If the list is malformed.
+    """
+    try:
+        values = tuple(int(part) for part in text.split(","))
+    except ValueError:
+        values = ()
+    if len(values) != count:
+        raise argparse.ArgumentTypeError(
+            f"Expected {count} comma separated integers, got '{text}'"
+        )
+    return values
+
+
+def split_into_chunks(
+    frame_count: int, stride: int, chunk_count: int
+) -> list[tuple[int, int | None]]:
+    """Splits [0, frame_count) into stride-aligned (start, end) ranges.
+
+    The last range is open-ended (end=None) because CAP_PROP_FRAME_COUNT is
+    only an estimate for many containers.
+
+    Args:
+        frame_count (int): Reported number of frames in the video.
+        stride (int): Only every 'stride'-th frame is processed.
+        chunk_count (int): Desired number of ranges.
+
+    Returns:
+        list[tuple[int, int | None]]: Frame ranges, in order.
+    """
+    sampled_frames = max(1, -(-frame_count // stride))
+    chunk_count = max(1, min(chunk_count, sampled_frames))
+    samples_per_chunk = -(-sampled_frames // chunk_count)
+
+    chunks: list[tuple[int, int | None]] = []
+    for start_sample in range(0, sampled_frames, samples_per_chunk):
+        start = start_sample * stride
+        end = (start_sample + samples_per_chunk) * stride
+        chunks.append((start, end))
+    chunks[-1] = (chunks[-1][0], None)
+    return chunks
+
+
+def seek_to_frame(
+    video_capture: cv2.VideoCapture, video_path: str, start: int
+) -> int:
+    """Positions a capture so that the next grab() returns frame 'start'.
+
+    Seeking is only approximate for many containers: set() may fail or land 
+    on a nearby keyframe. The position is read back, and if the seek failed 
+    or overshot, the file is reopened and frames are grabbed forward from 
+    the beginning instead.
+
+    Args:
+        video_capture (cv2.VideoCapture): Freshly opened capture.
+        video_path (str): Path of the opened file, used to reopen it.
+        start (int): Target frame index.
+
+    Returns:
+        int: Index of the frame the next grab() returns. Less than 'start' 
+        only if the video ends before it.
+    """
+    if start == 0:
+        return 0
+
+    position = -1
+    if video_capture.set(cv2.CAP_PROP_POS_FRAMES, start):
+        position = int(video_capture.get(cv2.CAP_PROP_POS_FRAMES))
+    if not 0 <= position <= start:
+        video_capture.open(video_path)
+        position = 0
+    while position < start and video_capture.grab():
+        position += 1
+    return position
+
+
+def process_chunk(
+    video_path: str,
+    start: int,
+    end: int | None,
+    stride: int,
+    roi_coordinates: tuple[int, int, int, int],
+    roi_quad: ROI_Quad | None,
+    scale: float,
+    mode: int,
+    simple_threshold: int,
+    psm: int,
+    is_clahe_enabled: bool,
+    is_morphology_enabled: bool,
+    quality_floor: QualityThresholds | None,
+) -> tuple[list[Reading], int, int]:
+    """Decodes and OCRs one frame range. Runs inside a worker process.
+
+    Skipped frames are only grabbed, never retrieved, so they are not
+    converted to BGR.
+
+    Args:
+        video_path (str): Path to the video file.
+        start (int): First frame index (inclusive).
+        end (int | None): Last frame index (exclusive), or None for EOF.
+        stride (int): Only every 'stride'-th frame is OCR'd.
+        roi_coordinates (tuple[int, int, int, int]): (x, y, w, h) crop box.
+        roi_quad (ROI_Quad | None): Perspective quad, or None.
+        scale, mode, simple_threshold, psm, is_clahe_enabled,
+        is_morphology_enabled: Same meaning as in the live application.
+        quality_floor (QualityThresholds | None): Absolute quality limits.
+        As in the live application, they are tightened by the median of
+        the chunk's recently accepted frames; frames failing the gate are
+        skipped before processing and OCR. None disables the gate.
+
+    Returns:
+        tuple[list[Reading], int, int]: Valid readings, number of frames 
+        OCR'd and number of frames skipped by the quality gate.
+    """
+    # Parallelism comes from the process pool, keep each worker single threaded
+    cv2.setNumThreads(1)
+
+    video_capture = cv2.VideoCapture(video_path)
+    frame_index = seek_to_frame(video_capture, video_path, start)
+
+    clahe = cv2.createCLAHE(
+        clipLimit=config.CLAHE_CLIP_LIMIT,
+        tileGridSize=config.CLAHE_TILE_GRID_SIZE,
+    )
+    rectify_maps = get_rectify_maps(roi_quad, scale) if roi_quad else None
+    x, y, w, h = roi_coordinates
+
+    quality_reference = deque(maxlen=config.QUALITY_REFERENCE_FRAMES)
+    readings: list[Reading] = []
+    processed_count = 0
+    skipped_count = 0
+    while end is None or frame_index < end:
+        if not video_capture.grab():
+            break
+        # Chunks start on multiples of 'stride', so the phase is global
+        if frame_index % stride == 0:
+            video_time = (
+                video_capture.get(cv2.CAP_PROP_POS_MSEC) / MS_PER_SECOND
+            )
+            is_frame_read, frame = video_capture.retrieve()
+            roi_cropped = frame[y : y + h, x : x + w] if is_frame_read else None
+
+            rejection_reason = None
+            if quality_floor and is_frame_read:
+                quality_thresholds = thresholds_from_reference(
+                    list(quality_reference),
+                    config.QUALITY_SHARPNESS_RATIO,
+                    config.QUALITY_CONTRAST_RATIO,
+                    config.QUALITY_SATURATION_MARGIN,
+                    quality_floor,
+                )
+                rejection_reason, quality_metrics = check_quality(
+                    rectify_roi(roi_cropped, roi_quad) if roi_quad
+                    else roi_cropped,
+                    quality_thresholds,
+                )
+                if rejection_reason is None:
+                    quality_reference.append(quality_metrics)
+
+            if rejection_reason:
+                skipped_count += 1
+            elif is_frame_read:
+                binary_image = process_image(
+                    roi_cropped,
+                    scale,
+                    is_clahe_enabled,
+                    clahe,
+                    mode,
+                    simple_threshold,
+                    is_morphology_enabled,
+                    rectify_maps,
+                )
+                ocr_text, _ = perform_ocr(binary_image, psm)
+                processed_count += 1
+                if ocr_text:
+                    readings.append((frame_index, video_time, ocr_text))
+        frame_index += 1
+
+    video_capture.release()
+    return readings, processed_count, skipped_count
+
+
+def write_series_to_csv(rows: list[Reading], filename: str) -> bool:
+    """Writes a (frame, video time, value) series to a CSV file.
+
+    Args:
+        rows (list[Reading]): Readings sorted by frame index.
+        filename (str): Path to the CSV file (overwritten if it exists).
+
+    Returns:
+        bool: True if save was successful, otherwise False.
+    """
+    try:
+        with open(filename, "w", newline="", encoding="utf-8") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(SERIES_HEADER_ROW)
+            for frame_index, video_time, value in rows:
+                writer.writerow([frame_index, f"{video_time:.3f}", value])
+        return True
+    except PermissionError:
+        print(
+            f"ERROR: Could not save to '{filename}'. Is it open?",
+            file=sys.stderr,
+        )
+        return False
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    """Creates the command line interface for batch processing."""
+    parser = argparse.ArgumentParser(
+        description="Extract numeric readings from a recorded video file."
+    )
+    parser.add_argument("video", help="Path to the video file.")
+    roi_group = parser.add_mutually_exclusive_group(required=True)
+    roi_group.add_argument(
+        "--roi",
+        type=lambda text: parse_int_list(text, 4),
+        help="Axis-aligned ROI as x,y,w,h.",
+    )
+    roi_group.add_argument(
+        "--quad",
+        type=lambda text: parse_int_list(text, 8),
+        help="Perspective ROI corners as x1,y1,x2,y2,x3,y3,x4,y4.",
+    )
+    parser.add_argument(
+        "-o", "--output", default=config.BATCH_OUTPUT_FILENAME,
+        help="Output file, .csv or .xlsx.",
+    )
+    parser.add_argument(
+        "--stride", type=int, default=config.BATCH_FRAME_STRIDE,
+        help="Process every n-th frame.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1,
+        help="Number of worker processes.",
+    )
+    parser.add_argument("--scale", type=float, default=config.DEFAULT_SCALE)
+    parser.add_argument("--mode", type=int, default=config.DEFAULT_MODE)
+    parser.add_argument(
+        "--threshold", type=int, default=config.DEFAULT_SIMPLE_THRESHOLD
+    )
+    parser.add_argument("--psm", type=int, default=config.DEFAULT_PSM)
+    parser.add_argument(
+        "--no-clahe", dest="is_clahe_enabled", action="store_false",
+        default=config.IS_CLAHE_ENABLED,
+    )
+    parser.add_argument(
+        "--morphology", dest="is_morphology_enabled", action="store_true",
+        default=config.IS_MORPHOLOGY_ENABLED,
+    )
+    parser.add_argument(
+        "--quality-gate", dest="is_quality_gate_enabled",
+        action="store_true",
+        help="Skip blurred, glared or covered frames instead of OCR'ing them.",
+    )
+    parser.add_argument(
+        "--min-sharpness", type=float, default=config.QUALITY_MIN_SHARPNESS
+    )
+    parser.add_argument(
+        "--max-saturated-fraction", type=float,
+        default=config.QUALITY_MAX_SATURATED_FRACTION,
+    )
+    parser.add_argument(
+        "--min-contrast", type=float, default=config.QUALITY_MIN_CONTRAST
+    )
+    return parser
+
+
+def main() -> None:
+    """Runs batch OCR over a video file and reports throughput.
+
+    Raises:
+        RuntimeError: If the video file cannot be opened.
+    """
+    args = build_argument_parser().parse_args()
+    stride = max(1, args.stride)
+    workers = max(1, args.workers)
+
+    if args.quad:
+        roi_quad = order_quad(list(zip(args.quad[::2], args.quad[1::2])))
+        if not is_valid_quad(roi_quad):
+            sys.exit(
+                f"ERROR: --quad {args.quad} does not form a convex "
+                "quadrilateral with four distinct corners."
+            )
+        roi_coordinates = quad_bounding_rect(roi_quad)
+    else:
+        roi_quad = None
+        roi_coordinates = args.roi
+
+    quality_floor = None
+    if args.is_quality_gate_enabled:
+        quality_floor = (
+            args.min_sharpness,
+            args.max_saturated_fraction,
+            args.min_contrast,
+        )
+
+    video_capture = cv2.VideoCapture(args.video)
+    if not video_capture.isOpened():
+        raise RuntimeError(f"Could not open video file '{args.video}'.")
+    frame_count = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+    frame_width = int(video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+    frame_height = int(video_capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    video_capture.release()
+
+    x, y, w, h = roi_coordinates
+    if w <= 0 or h <= 0 or x < 0 or y < 0 or \
+    x + w > frame_width or y + h > frame_height:
+        sys.exit(
+            f"ERROR: ROI (x={x}, y={y}, w={w}, h={h}) does not fit inside the "
+            f"{frame_width}x{frame_height} video frame."
+        )
+
+    chunks = split_into_chunks(
+        frame_count, stride, workers * config.BATCH_CHUNKS_PER_WORKER
+    )
+    print(
+        f"Processing '{args.video}': ~{frame_count} frames, stride {stride}, "
+        f"{len(chunks)} chunks on {workers} workers"
+    )
+
+    # Tesseract would otherwise start one OpenMP thread per core in every worker
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+    readings: list[Reading] = []
+    processed_count = 0
+    skipped_count = 0
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=setup_tesseract
+    ) as executor:
+        futures = [
+            executor.submit(
+                process_chunk,
+                args.video,
+                start,
+                end,
+                stride,
+                roi_coordinates,
+                roi_quad,
+                args.scale,
+                args.mode,
+                args.threshold,
+                args.psm,
+                args.is_clahe_enabled,
+                args.is_morphology_enabled,
+                quality_floor,
+            )
+            for start, end in chunks
+        ]
+        for future in as_completed(futures):
+            chunk_readings, chunk_processed, chunk_skipped = future.result()
+            readings.extend(chunk_readings)
+            processed_count += chunk_processed
+            skipped_count += chunk_skipped
+    elapsed = time.perf_counter() - start_time
+
+    readings.sort()
+    if args.output.lower().endswith(EXCEL_EXTENSION):
+        is_saved = write_series_to_excel(readings, args.output)
+    else:
+        is_saved = write_series_to_csv(readings, args.output)
+
+    sampled_count = processed_count + skipped_count
+    fps = sampled_count / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Sampled {sampled_count} frames in {elapsed:.1f}s ({fps:.1f} frames/s), "
+        f"{skipped_count} skipped by quality gate, {len(readings)} readings"
+        + (f" saved to '{args.output}'" if is_saved else "")
+    )
+    if skipped_count > sampled_count / 2:
+        print(
+            f"Warning: the quality gate skipped {skipped_count} of "
+            f"{sampled_count} sampled frames. Check the ROI, loosen "
+            "--min-sharpness/--min-contrast/--max-saturated-fraction or drop "
+            "--quality-gate.",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
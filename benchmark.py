@@ -0,0 +1,503 @@
+"""Per-stage microbenchmarks on synthetic readouts.
+
+Times process_image(), measure_quality(), extract_number(), perform_ocr(),
+write_to_excel() and overlay label drawing across input sizes, reports
+latency, throughput and peak Python-side memory, and saves everything to a
+JSON file that later runs can be compared against. Cached overlay labels are
+also checked pixel for pixel against direct drawing.
+
+Example:
+    python benchmark.py --output benchmark_baseline.json
+    python benchmark.py --compare benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable
+
+import cv2
+import numpy as np
+
+import config
+from excel_logging import initiate_excel, write_to_excel
+from image_processing import get_rectify_maps, process_image
+from ocr import extract_number, perform_ocr
+from quality_gate import measure_quality
+from synthetic_digits import SEVEN_SEGMENT, generate_dataset, render_readout
+from ui_drawing import (
+    COLOR_BLACK,
+    COLOR_YELLOW,
+    HUD_SCALE,
+    LABEL_BG_PADDING,
+    LABEL_DEFAULT_SCALE,
+    LABEL_FONT,
+    LABEL_THICKNESS,
+    draw_label,
+)
+
+
+# --- Constants ---
+DEFAULT_OUTPUT_FILENAME = "benchmark_results.json"
+DEFAULT_REPEATS = 30
+QUICK_REPEATS = 5
+WARMUP_RUNS = 2
+DEFAULT_TOLERANCE = 0.15  # Allowed slowdown before a case counts as regression
+DEFAULT_MIN_DIFFERENCE_MS = 0.05  # Smaller median changes are timer noise
+# Baselines taken with other values of these aren't comparable
+COMPARABLE_METADATA_KEYS = ("cpu_count", "opencv", "opencv_threads")
+P95_QUANTILE_INDEX = 94  # statistics.quantiles(n=100) index of p95
+
+# --- Workloads ---
+SAMPLE_TEXT = "-1234.56"
+SAMPLE_STYLE = (SEVEN_SEGMENT, 6.0, 0.6, 4.0, 0.8, False)
+ROI_SIZE_FACTORS = {"small": 0.5, "medium": 1.0, "large": 2.0}
+PROCESS_SCALES = (1.5, 2.5, 4.0)
+EXTRACT_INPUTS = {
+    "short": "12.3",
+    "noisy": " ,.- 0012,50 mV\n",
+    "long": "x" * 200 + " -98765.4321 " + "y" * 200,
+    "no_number": "-.-,-" * 40,
+}
+OCR_SAMPLES = 20
+FRAME_SHAPE = (480, 640, 3)
+LABEL_CASES = {
+    "hud": (
+        "Mode:1 PSM: 7 Thr:- CLAHE:on Morph:off Gate:on(3) FPS:29.8 | IDLE",
+        (10, 460),
+        HUD_SCALE,
+    ),
+    "ocr": ("OCR: -1234.56", (200, 120), LABEL_DEFAULT_SCALE),
+    "clipped": ("OCR: 12.3", (-20, 8), LABEL_DEFAULT_SCALE),
+}
+EXCEL_EXISTING_ROWS = (0, 1000, 10000)
+EXCEL_WRITES = 10
+
+# --- Type Aliases ---
+BenchmarkResult = dict[str, float | str | None]
+
+
+def time_calls(
+    function: Callable[[], object], repeats: int
+) -> tuple[list[float], float]:
+    """Times repeated calls and measures peak traced memory of one more call.
+
+    Memory is measured in a separate call, because tracemalloc slows down
+    allocation-heavy code and would distort the timings.
+
+    Args:
+        function (Callable[[], object]): Zero-argument callable to time.
+        repeats (int): Number of timed calls.
+
+    Returns:
+        tuple[list[float], float]: Per-call durations in milliseconds and peak
+        traced allocation in KiB.
+    """
+    for _ in range(WARMUP_RUNS):
+        function()
+
+    durations_ms = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        durations_ms.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    function()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return durations_ms, peak_bytes / 1024
+
+
+def summarize(
+    stage: str,
+    case: str,
+    durations_ms: list[float],
+    peak_kib: float,
+    pixels: int | None = None,
+) -> BenchmarkResult:
+    """Turns raw durations into one result row.
+
+    Args:
+        stage (str): Pipeline stage name, e.g. "process_image".
+        case (str): Workload description within the stage.
+        durations_ms (list[float]): Per-call durations in milliseconds.
+        peak_kib (float): Peak traced memory of one call.
+        pixels (int | None): Input pixels per call, for megapixel throughput.
+
+    Returns:
+        BenchmarkResult: Summary statistics for the case.
+    """
+    median_ms = statistics.median(durations_ms)
+    if len(durations_ms) > 1:
+        p95_ms = statistics.quantiles(durations_ms, n=100)[P95_QUANTILE_INDEX]
+    else:
+        p95_ms = durations_ms[0]
+    calls_per_s = 1000.0 / median_ms if median_ms > 0 else float("inf")
+    return {
+        "stage": stage,
+        "case": case,
+        "median_ms": round(median_ms, 4),
+        "p95_ms": round(p95_ms, 4),
+        "calls_per_s": round(calls_per_s, 2),
+        "megapixels_per_s": (
+            round(pixels * calls_per_s / 1e6, 3) if pixels else None
+        ),
+        "peak_memory_kib": round(peak_kib, 1),
+    }
+
+
+def make_roi(size_factor: float) -> np.ndarray:
+    """Renders the reference readout resized to the given ROI size factor."""
+    image = render_readout(SAMPLE_TEXT, SAMPLE_STYLE)
+    return cv2.resize(
+        image, None, fx=size_factor, fy=size_factor,
+        interpolation=cv2.INTER_AREA if size_factor < 1 else cv2.INTER_CUBIC,
+    )
+
+
+def bench_process_image(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks process_image() per ROI size and scale, plain and remapped."""
+    clahe = cv2.createCLAHE(
+        clipLimit=config.CLAHE_CLIP_LIMIT,
+        tileGridSize=config.CLAHE_TILE_GRID_SIZE,
+    )
+    results = []
+    for size_name, size_factor in ROI_SIZE_FACTORS.items():
+        roi = make_roi(size_factor)
+        height, width = roi.shape[:2]
+        quad = ((0, 0), (width - 1, 0), (width - 1, height - 1), (0, height - 1))
+        for scale in PROCESS_SCALES:
+            for variant, rectify_maps in (
+                ("resize", None),
+                ("remap", get_rectify_maps(quad, scale)),
+            ):
+                durations, peak = time_calls(
+                    lambda: process_image(
+                        roi, scale, True, clahe, config.DEFAULT_MODE,
+                        config.DEFAULT_SIMPLE_THRESHOLD, False, rectify_maps,
+                    ),
+                    repeats,
+                )
+                results.append(summarize(
+                    "process_image",
+                    f"{size_name} {width}x{height} scale={scale} {variant}",
+                    durations, peak, width * height,
+                ))
+    return results
+
+
+def bench_measure_quality(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks the quality gate metrics per ROI size."""
+    results = []
+    for size_name, size_factor in ROI_SIZE_FACTORS.items():
+        roi = make_roi(size_factor)
+        height, width = roi.shape[:2]
+        durations, peak = time_calls(lambda: measure_quality(roi), repeats)
+        results.append(summarize(
+            "measure_quality", f"{size_name} {width}x{height}",
+            durations, peak, width * height,
+        ))
+    return results
+
+
+def bench_extract_number(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks extract_number() on representative OCR outputs."""
+    results = []
+    for case, text in EXTRACT_INPUTS.items():
+        durations, peak = time_calls(lambda: extract_number(text), repeats)
+        results.append(summarize(
+            "extract_number", f"{case} len={len(text)}", durations, peak
+        ))
+    return results
+
+
+def _draw_label_reference(
+    img: np.ndarray, text: str, position: tuple[int, int], scale: float
+) -> None:
+    """Draws a label directly, without the sprite cache (the original code)."""
+    (text_width, text_height), baseline = cv2.getTextSize(
+        text, LABEL_FONT, scale, LABEL_THICKNESS
+    )
+    x, y = position
+    cv2.rectangle(
+        img,
+        (x - LABEL_BG_PADDING, y - text_height - LABEL_BG_PADDING),
+        (x + text_width + LABEL_BG_PADDING, y + baseline + LABEL_BG_PADDING),
+        COLOR_BLACK,
+        -1
+    )
+    cv2.putText(
+        img, text, (x, y), LABEL_FONT, scale, COLOR_YELLOW, LABEL_THICKNESS,
+        cv2.LINE_AA,
+    )
+
+
+def bench_draw_label(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks cached draw_label() against direct drawing and checks that
+    both produce identical pixels."""
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, FRAME_SHAPE, dtype=np.uint8)
+    results = []
+    for case, (text, position, scale) in LABEL_CASES.items():
+        cached = frame.copy()
+        reference = frame.copy()
+        draw_label(cached, text, position, scale=scale)
+        _draw_label_reference(reference, text, position, scale)
+        matches_reference = bool(np.array_equal(cached, reference))
+
+        for variant, function in (
+            ("cached", lambda: draw_label(frame, text, position, scale=scale)),
+            ("direct", lambda: _draw_label_reference(
+                frame, text, position, scale
+            )),
+        ):
+            durations, peak = time_calls(function, repeats)
+            result = summarize(
+                "draw_label", f"{case} {variant}", durations, peak
+            )
+            result["matches_reference"] = matches_reference
+            results.append(result)
+    return results
+
+
+def bench_perform_ocr(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks perform_ocr() per ROI size on the synthetic dataset and
+    records the exact-match accuracy against ground truth.
+
+    Returns an empty list if Tesseract is not installed.
+    """
+    import pytesseract
+
+    try:
+        pytesseract.get_tesseract_version()
+    except pytesseract.TesseractNotFoundError:
+        print("Tesseract not found, skipping perform_ocr", file=sys.stderr)
+        return []
+
+    clahe = cv2.createCLAHE(
+        clipLimit=config.CLAHE_CLIP_LIMIT,
+        tileGridSize=config.CLAHE_TILE_GRID_SIZE,
+    )
+    sample_count = min(OCR_SAMPLES, max(repeats, 1))
+    dataset = generate_dataset(sample_count)
+    results = []
+    for size_name, size_factor in ROI_SIZE_FACTORS.items():
+        durations_ms = []
+        correct = 0
+        for image, text, _ in dataset:
+            roi = cv2.resize(image, None, fx=size_factor, fy=size_factor)
+            binary_image = process_image(
+                roi, config.DEFAULT_SCALE, True, clahe, config.DEFAULT_MODE,
+                config.DEFAULT_SIMPLE_THRESHOLD, False,
+            )
+            start = time.perf_counter()
+            ocr_text, _ = perform_ocr(binary_image, config.DEFAULT_PSM)
+            durations_ms.append((time.perf_counter() - start) * 1000)
+            correct += ocr_text == text
+        result = summarize(
+            "perform_ocr", f"{size_name} synthetic x{sample_count}",
+            durations_ms, 0.0,
+        )
+        result["peak_memory_kib"] = None  # Tesseract runs out of process
+        result["accuracy"] = round(correct / sample_count, 3)
+        results.append(result)
+    return results
+
+
+def bench_write_to_excel(repeats: int) -> list[BenchmarkResult]:
+    """Benchmarks write_to_excel() as the workbook grows."""
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for existing_rows in EXCEL_EXISTING_ROWS:
+            filename = os.path.join(temp_dir, f"bench_{existing_rows}.xlsx")
+            with contextlib.redirect_stdout(io.StringIO()):
+                initiate_excel(filename)
+                if existing_rows:
+                    from openpyxl import load_workbook
+
+                    workbook = load_workbook(filename)
+                    sheet = workbook.active
+                    for row in range(existing_rows):
+                        sheet.append([f"2000-01-01 00:00:{row % 60:02d}", row])
+                    workbook.save(filename)
+                durations, peak = time_calls(
+                    lambda: write_to_excel("12.34", filename),
+                    min(repeats, EXCEL_WRITES),
+                )
+            results.append(summarize(
+                "write_to_excel", f"existing_rows={existing_rows}",
+                durations, peak,
+            ))
+    return results
+
+
+def collect_metadata() -> dict[str, str | int | None]:
+    """Describes the environment so baselines are compared like for like."""
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "opencv": cv2.__version__,
+        "numpy": np.__version__,
+        "opencv_threads": cv2.getNumThreads(),
+    }
+
+
+def find_environment_mismatches(
+    metadata: dict, baseline_metadata: dict
+) -> list[str]:
+    """Lists the COMPARABLE_METADATA_KEYS that differ from the baseline.
+
+    Args:
+        metadata (dict): Metadata of the current run (see collect_metadata).
+        baseline_metadata (dict): Metadata stored in the baseline file.
+
+    Returns:
+        list[str]: One "key: baseline -> current" line per difference.
+    """
+    return [
+        f"{key}: {baseline_metadata.get(key)} -> {metadata.get(key)}"
+        for key in COMPARABLE_METADATA_KEYS
+        if baseline_metadata.get(key) != metadata.get(key)
+    ]
+
+
+def compare_results(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    tolerance: float,
+    min_difference_ms: float,
+) -> int:
+    """Prints per-case slowdowns against a baseline.
+
+    Args:
+        results (list[BenchmarkResult]): Current run.
+        baseline (list[BenchmarkResult]): Results loaded from a baseline file.
+        tolerance (float): Allowed relative slowdown of the median.
+        min_difference_ms (float): Median changes up to this many
+        milliseconds never count as regressions, so sub-microsecond cases
+        don't fail on timer noise.
+
+    Returns:
+        int: Number of cases that regressed beyond both limits.
+    """
+    baseline_by_key = {(row["stage"], row["case"]): row for row in baseline}
+    regressions = 0
+    print("\nComparison with baseline (median, current / baseline):")
+    for row in results:
+        previous = baseline_by_key.get((row["stage"], row["case"]))
+        if not previous or not previous["median_ms"]:
+            continue
+        ratio = row["median_ms"] / previous["median_ms"]
+        difference_ms = row["median_ms"] - previous["median_ms"]
+        is_regression = (
+            ratio > 1.0 + tolerance and difference_ms > min_difference_ms
+        )
+        regressions += is_regression
+        print(
+            f"  {'REGRESSION' if is_regression else 'ok':<10} "
+            f"{ratio:6.2f}x {difference_ms:+9.3f} ms  "
+            f"{row['stage']}: {row['case']}"
+        )
+    return regressions
+
+
+def main() -> None:
+    """Runs all stage benchmarks, saves the results and optionally compares
+    them against a baseline file (exit code 1 on regressions)."""
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark each stage of the OCR pipeline."
+    )
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_FILENAME)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument(
+        "--quick", action="store_true",
+        help=f"Use {QUICK_REPEATS} repeats per case.",
+    )
+    parser.add_argument("--compare", help="Baseline JSON file to compare to.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        "--min-difference-ms", type=float, default=DEFAULT_MIN_DIFFERENCE_MS,
+        help="Ignore median slowdowns smaller than this.",
+    )
+    parser.add_argument(
+        "--allow-environment-mismatch", action="store_true",
+        help="Compare even if CPU count or OpenCV build/threads differ.",
+    )
+    args = parser.parse_args()
+    repeats = QUICK_REPEATS if args.quick else max(1, args.repeats)
+    metadata = collect_metadata()
+
+    # Checked before the run, so an unusable baseline fails fast
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        environment_differences = find_environment_mismatches(
+            metadata, baseline.get("metadata", {})
+        )
+        if environment_differences:
+            print(
+                "Baseline was recorded in a different environment:\n  "
+                + "\n  ".join(environment_differences),
+                file=sys.stderr,
+            )
+            if not args.allow_environment_mismatch:
+                sys.exit(
+                    "ERROR: Refusing to compare. Record a new baseline or "
+                    "pass --allow-environment-mismatch."
+                )
+
+    results: list[BenchmarkResult] = []
+    for bench in (
+        bench_process_image,
+        bench_measure_quality,
+        bench_extract_number,
+        bench_draw_label,
+        bench_perform_ocr,
+        bench_write_to_excel,
+    ):
+        for row in bench(repeats):
+            results.append(row)
+            print(
+                f"{row['stage']:<16} {row['case']:<40} "
+                f"median {row['median_ms']:9.3f} ms  "
+                f"p95 {row['p95_ms']:9.3f} ms  "
+                f"{row['calls_per_s']:10.1f}/s"
+            )
+
+    mismatches = [
+        row for row in results if row.get("matches_reference") is False
+    ]
+    for row in mismatches:
+        print(f"MISMATCH: {row['stage']}: {row['case']}", file=sys.stderr)
+
+    with open(args.output, "w", encoding="utf-8") as output_file:
+        json.dump(
+            {"metadata": metadata, "results": results},
+            output_file,
+            indent=2,
+        )
+    print(f"Saved results to '{args.output}'")
+
+    if baseline and compare_results(
+        results, baseline["results"], args.tolerance, args.min_difference_ms
+    ):
+        sys.exit(1)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,22 @@ FPS_CALCULATION_INTERVAL_SECONDS = 1.0
 DEFAULT_FPS = 0.0
 DEFAULT_FRAME_COUNT = 0
 DEFAULT_LAST_OCR_TEXT = ""
+DEBUG_WINDOW_FPS = 5.0  # ROI/Preprocessed window rate; <= 0 = every frame
+
+
+# --- Frame Quality Gate (skips OCR on unusable ROI crops) ---
+IS_QUALITY_GATE_ENABLED = True
+# Live app: limits follow the median of the last accepted frames of the
+# current ROI (reset on 's'/'r'), so they adapt to each display
+QUALITY_REFERENCE_FRAMES = 25  # Accepted frames in the rolling reference
+QUALITY_SHARPNESS_RATIO = 0.6  # Blurred below 60% of reference sharpness
+QUALITY_CONTRAST_RATIO = 0.5  # Covered below 50% of reference contrast
+QUALITY_SATURATION_MARGIN = 0.25  # Allowed extra blown-out share (glare)
+QUALITY_WARN_CONSECUTIVE_SKIPS = 25  # Warn when OCR is skipped this often
+# Absolute limits: always enforced, and used alone until a reference exists
+QUALITY_MIN_SHARPNESS = 0.15  # Edge slope (~0.35 crisp); lower = blurred
+QUALITY_MAX_SATURATED_FRACTION = 0.5  # Share of blown-out pixels (glare)
+QUALITY_MIN_CONTRAST = 20.0  # Dark-to-bright gray range; lower = blank/covered
 
 
 # --- Video Capture Parameters ---
@@ -32,3 +48,17 @@ CAMERA_INDEX = 1  # The index of your webcam (0, 1, 2, etc.)
 CLAHE_CLIP_LIMIT = 2.0
 CLAHE_TILE_GRID_SIZE = (8, 8)
 
+
+# --- Batch (Recorded Video) Parameters ---
+BATCH_FRAME_STRIDE = 1  # Process every n-th frame
+BATCH_CHUNKS_PER_WORKER = 4  # More chunks = better load balancing, more seeks
+BATCH_OUTPUT_FILENAME = "video_measurements.csv"
+
+
+# --- Streaming Server Parameters ---
+IS_STREAM_SERVER_ENABLED = True
+STREAM_SERVER_HOST = "127.0.0.1"  # Localhost only
+STREAM_SERVER_PORT = 8765
+STREAM_PREVIEW_FPS = 5.0
+STREAM_PREVIEW_JPEG_QUALITY = 70
+
@@ -1,14 +1,13 @@
 import os
 import sys
 from datetime import datetime
-from openpyxl import Workbook, load_workbook
-from openpyxl.utils.exceptions import InvalidFileException
 
 
 # --- Constants ---
 DEFAULT_FILE_NAME = "measurements.xlsx"
 DEFAULT_SHEET_TITLE = "Data"
 HEADER_ROW = ["Timestamp", "Value"]
+SERIES_HEADER_ROW = ["Frame", "Video Time (s)", "Value"]
 TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 
@@ -19,6 +18,8 @@ def initiate_excel(filename: str = DEFAULT_FILE_NAME) -> None:
         filename (str): Path to the Excel file. Defaults to DEFAULT_FILE_NAME.
     """
     if not os.path.exists(filename):
+        from openpyxl import Workbook
+
         print(f"Creating new Excel file: {filename}")
         workbook = Workbook()
         sheet = workbook.active
@@ -43,6 +44,10 @@ def write_to_excel(value: str | float, filename: str = DEFAULT_FILE_NAME) -> boo
     Returns:
         bool: True if save was successful, otherwise False.
     """
+    # openpyxl is only imported once saving is actually used
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
     try:
         workbook = load_workbook(filename)
         sheet = workbook.active
@@ -79,3 +84,36 @@ def write_to_excel(value: str | float, filename: str = DEFAULT_FILE_NAME) -> boo
         )
         return False
 
+
+def write_series_to_excel(
+    rows: list[tuple[int, float, str]],
+    filename: str,
+) -> bool:
+    """Writes a complete (frame, video time, value) series to a new Excel file.
+
+    Used by batch processing, where all readings are known up front, so the 
+    workbook is built once instead of reopened for every value.
+
+    Args:
+        rows (list[tuple[int, float, str]]): Readings sorted by frame index.
+        filename (str): Path to the Excel file (overwritten if it exists).
+
+    Returns:
+        bool: True if save was successful, otherwise False.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(DEFAULT_SHEET_TITLE)
+    sheet.append(SERIES_HEADER_ROW)
+    for frame_index, video_time, value in rows:
+        sheet.append([frame_index, round(video_time, 3), float(value)])
+    try:
+        workbook.save(filename)
+        return True
+    except PermissionError:
+        print(
+            f"ERROR: Could not save to Excel. Is '{filename}' open?",
+            file=sys.stderr,
+        )
+        return False
@@ -1,5 +1,6 @@
 import cv2
 import numpy as np
+from functools import lru_cache
 
 
 # --- Pipeline Constants ---
@@ -27,6 +28,147 @@ ADAPTIVE_THRESH_CONSTANT = 10
 MORPH_KERNEL_SIZE = (3, 3)
 MORPH_ITERATIONS = 1
 
+# --- Perspective Rectification ---
+RECTIFY_CACHE_SIZE = 8
+MIN_QUAD_AREA = 16.0  # Square pixels
+
+# --- Type Aliases ---
+ROI_Quad = tuple[
+    tuple[int, int], tuple[int, int], tuple[int, int], tuple[int, int]
+]
+RectifyMaps = tuple[np.ndarray, np.ndarray]
+
+
+def order_quad(points) -> ROI_Quad:
+    """Orders four corner points clockwise (on screen), starting top-left.
+
+    Points are sorted by angle around their centroid, so rotated shapes such 
+    as a diamond still give four different corners.
+
+    Args:
+        points: Any sequence of four (x, y) points, in any click order.
+
+    Returns:
+        ROI_Quad: The same points in clockwise order starting top-left.
+    """
+    pts = np.asarray(points, dtype=np.float32).reshape(4, 2)
+    center = pts.mean(axis=0)
+    angles = np.arctan2(pts[:, 1] - center[1], pts[:, 0] - center[0])
+    pts = pts[np.argsort(angles)]
+    start = int(np.argmin(pts.sum(axis=1)))
+    pts = np.roll(pts, -start, axis=0)
+    return tuple((int(x), int(y)) for x, y in pts)
+
+
+def is_valid_quad(quad: ROI_Quad) -> bool:
+    """Checks that an ordered quad can be rectified.
+
+    Repeated, collinear or self-intersecting corners give a singular 
+    homography, so only convex quads with four distinct corners and a 
+    non-trivial area are accepted.
+
+    Args:
+        quad (ROI_Quad): Corner points as returned by order_quad.
+
+    Returns:
+        bool: True if the quad is usable for get_rectify_maps.
+    """
+    if len(set(quad)) != 4:
+        return False
+    contour = np.array(quad, dtype=np.int32).reshape(-1, 1, 2)
+    return (
+        cv2.isContourConvex(contour)
+        and cv2.contourArea(contour) >= MIN_QUAD_AREA
+    )
+
+
+def quad_bounding_rect(quad: ROI_Quad) -> tuple[int, int, int, int]:
+    """Returns the axis-aligned (x, y, w, h) box enclosing the quadrilateral.
+
+    Args:
+        quad (ROI_Quad): Four corner points in frame coordinates.
+
+    Returns:
+        tuple[int, int, int, int]: Bounding box used to crop the ROI.
+    """
+    x, y, w, h = cv2.boundingRect(np.array(quad, dtype=np.int32))
+    return x, y, w, h
+
+
+@lru_cache(maxsize=RECTIFY_CACHE_SIZE)
+def get_rectify_maps(quad: ROI_Quad, scale: float) -> RectifyMaps:
+    """Builds cv2.remap tables that warp a quadrilateral ROI to an upright
+    rectangle and upscale it by 'scale' in one pass.
+
+    The maps are relative to the quad's bounding box, so they apply directly 
+    to the cropped ROI. Results are cached per (quad, scale), so the 
+    homography and per-pixel tables are only computed when the ROI or scale 
+    changes.
+
+    Args:
+        quad (ROI_Quad): Ordered corner points (see order_quad) in frame 
+        coordinates.
+        scale (float): Upscaling factor, same meaning as in process_image.
+
+    Returns:
+        RectifyMaps: Fixed-point (CV_16SC2, CV_16UC1) map pair for cv2.remap.
+    """
+    x, y, _, _ = quad_bounding_rect(quad)
+    source = np.array(quad, dtype=np.float32) - np.float32([x, y])
+    top_left, top_right, bottom_right, bottom_left = source
+
+    width = max(
+        np.linalg.norm(top_right - top_left),
+        np.linalg.norm(bottom_right - bottom_left),
+    )
+    height = max(
+        np.linalg.norm(bottom_left - top_left),
+        np.linalg.norm(bottom_right - top_right),
+    )
+    out_width = max(1, int(round(width * scale)))
+    out_height = max(1, int(round(height * scale)))
+
+    destination = np.array([
+        [0, 0],
+        [out_width - 1, 0],
+        [out_width - 1, out_height - 1],
+        [0, out_height - 1],
+    ], dtype=np.float32)
+    # Maps go from output pixels back to source pixels
+    homography = cv2.getPerspectiveTransform(destination, source)
+
+    grid_x, grid_y = np.meshgrid(
+        np.arange(out_width, dtype=np.float32),
+        np.arange(out_height, dtype=np.float32),
+    )
+    grid = np.dstack((grid_x, grid_y)).reshape(-1, 1, 2)
+    mapped = cv2.perspectiveTransform(grid, homography).reshape(
+        out_height, out_width, 2
+    )
+    map_x = np.ascontiguousarray(mapped[..., 0])
+    map_y = np.ascontiguousarray(mapped[..., 1])
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+def rectify_roi(roi_cropped: np.ndarray, quad: ROI_Quad) -> np.ndarray:
+    """Warps a bounding-box crop to the upright quad region at native size.
+
+    Used where only the display itself should be judged (e.g. the quality 
+    gate), without the background around a tilted quad.
+
+    Args:
+        roi_cropped (np.ndarray): The frame cropped to quad_bounding_rect(quad).
+        quad (ROI_Quad): Ordered corner points in frame coordinates.
+
+    Returns:
+        np.ndarray: The rectified ROI.
+    """
+    map_1, map_2 = get_rectify_maps(quad, 1.0)
+    return cv2.remap(
+        roi_cropped, map_1, map_2, cv2.INTER_LINEAR,
+        borderMode=cv2.BORDER_REPLICATE,
+    )
+
 
 def process_image(
     image: np.ndarray,
@@ -36,8 +178,12 @@ def process_image(
     mode: int,
     simple_threshold: int,
     is_morphology_enabled: bool,
+    rectify_maps: RectifyMaps | None = None,
 ) -> np.ndarray | None:
     """Applies the full 'scale-first' image processing pipeline to an image.
+
+    When 'rectify_maps' are given, the scale step is replaced by a single 
+    cv2.remap that both straightens the perspective and upscales the ROI.
     
     Args:
         image (np.ndarray): The raw BGR ROI image.
@@ -47,6 +193,8 @@ def process_image(
         mode (int): The selected thresholding mode (1-5).
         simple_threshold (int): The threshold value for mode 5.
         is_morphology_enabled (bool): Flag to enable/disable dilation.
+        rectify_maps (RectifyMaps | None): Cached maps from get_rectify_maps, 
+        or None for a plain axis-aligned ROI.
 
     Returns:
         np.ndarray | None: The final processed binary image, or None if input is 
@@ -56,9 +204,16 @@ def process_image(
             
     if roi_gray.shape[0] == 0 or roi_gray.shape[1] == 0:
         return None
-    gray_scaled = cv2.resize(
-        roi_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
-    )
+    if rectify_maps is not None:
+        map_xy, map_interpolation = rectify_maps
+        gray_scaled = cv2.remap(
+            roi_gray, map_xy, map_interpolation, interpolation=cv2.INTER_CUBIC,
+            borderMode=cv2.BORDER_REPLICATE,
+        )
+    else:
+        gray_scaled = cv2.resize(
+            roi_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC
+        )
     
     denoised = cv2.fastNlMeansDenoising(gray_scaled, h=DENOISE_STRENGTH)
     blurred = cv2.GaussianBlur(denoised, GAUSSIAN_BLUR_KERNEL, 0)
@@ -2,6 +2,13 @@ import cv2
 import numpy as np
 from typing import Tuple, Optional
 
+from image_processing import (
+    ROI_Quad,
+    is_valid_quad,
+    order_quad,
+    quad_bounding_rect,
+)
+
 
 # --- Constants ---
 ROI_WINDOW_NAME = "Webcam OCR - Live"
@@ -16,6 +23,12 @@ SCALE_STEP = 0.5
 SCALE_MIN = 1.0
 SCALE_MAX = 8.0
 
+# Quad ROI Selection
+QUAD_POINT_COUNT = 4
+QUAD_POINT_RADIUS = 4
+QUAD_POINT_COLOR = (0, 255, 0)
+QUAD_CANCEL_KEY = 27  # ESC
+
 # PSM Controls
 PSM_MODES = [7, 8, 13, 6]
 
@@ -26,10 +39,12 @@ SAVE_INTERVAL_MAX = 3600.0
 
 # --- Type Aliases ---
 ROI_Coordinates = Optional[Tuple[int, int, int, int]]
+Optional_ROI_Quad = Optional[ROI_Quad]
 
 HandleInputReturn = Tuple[
     bool,
     ROI_Coordinates,
+    Optional_ROI_Quad,
     int,
     int,
     float,
@@ -38,11 +53,53 @@ HandleInputReturn = Tuple[
     bool,
     bool,
     float,
+    bool,
 ]
+
+
+def select_quad(window_name: str, frame: np.ndarray) -> Optional_ROI_Quad:
+    """Lets the user click the four corners of a tilted ROI on the live window.
+
+    Args:
+        window_name (str): Window to attach the mouse callback to.
+        frame (np.ndarray): Frame shown while selecting (not modified).
+
+    Returns:
+        Optional_ROI_Quad: Ordered corner points, or None if cancelled.
+    """
+    points: list[tuple[int, int]] = []
+
+    def on_mouse(event, x, y, flags, param):
+        if event == cv2.EVENT_LBUTTONDOWN and len(points) < QUAD_POINT_COUNT:
+            points.append((x, y))
+
+    cv2.setMouseCallback(window_name, on_mouse)
+    try:
+        while len(points) < QUAD_POINT_COUNT:
+            preview = frame.copy()
+            for point in points:
+                cv2.circle(
+                    preview, point, QUAD_POINT_RADIUS, QUAD_POINT_COLOR, -1
+                )
+            if len(points) > 1:
+                cv2.polylines(
+                    preview, [np.array(points, np.int32)], False,
+                    QUAD_POINT_COLOR, 1,
+                )
+            cv2.imshow(window_name, preview)
+            if cv2.waitKey(20) & 0xFF == QUAD_CANCEL_KEY:
+                return None
+    finally:
+        cv2.setMouseCallback(window_name, lambda *args: None)
+
+    return order_quad(points)
+
+
 def handle_input(
     key_pressed: int,
     frame: np.ndarray,
     roi_coordinates: ROI_Coordinates,
+    roi_quad: Optional_ROI_Quad,
     mode: int,
     simple_threshold: int,
     scale: float,
@@ -51,6 +108,7 @@ def handle_input(
     is_morphology_enabled: bool,
     is_saving: bool,
     save_interval: float,
+    is_quality_gate_enabled: bool,
 ) -> HandleInputReturn:
     """Handles all keyboard inputs and returns the updated application state.
     This function does not modify the state directly, but returns new state
@@ -60,6 +118,7 @@ def handle_input(
         key_pressed (int): (0xFF & cv2.waitKey(1)) value.
         frame (np.ndarray): Current camera frame, needed for cv2.selectROI.
         roi_coordinates (ROI_Coordinates): Current (x, y, w, h) or None.
+        roi_quad (Optional_ROI_Quad): Current perspective quad or None.
         mode (int): Current thresholding mode.
         simple_threshold (int): Current simple threshold value.
         scale (float): Current image processing scale.
@@ -68,6 +127,7 @@ def handle_input(
         is_morphology_enabled (bool): Current morphology flag.
         is_saving (bool): Current saving flag.
         save_interval (float): Current save interval in seconds.
+        is_quality_gate_enabled (bool): Current quality gate flag.
 
     Returns:
         HandleInputReturn: Tuple containing new state.
@@ -84,6 +144,16 @@ def handle_input(
         )
         if selection[2] > 0 and selection[3] > 0:
             roi_coordinates = selection
+            roi_quad = None
+
+    elif key_pressed == ord('r'):
+        print("Click the 4 corners of the display (ESC to cancel)")
+        selection = select_quad(ROI_WINDOW_NAME, frame)
+        if selection is not None and not is_valid_quad(selection):
+            print("Corners must form a convex shape. Selection ignored.")
+        elif selection is not None:
+            roi_coordinates = quad_bounding_rect(selection)
+            roi_quad = selection
 
     elif key_pressed == ord('1'):
         mode = 1
@@ -125,6 +195,12 @@ def handle_input(
         psm = PSM_MODES[(current_index + 1) % len(PSM_MODES)]
         print(f"PSM set to: {psm}")
 
+    elif key_pressed == ord('g'):
+        is_quality_gate_enabled = not is_quality_gate_enabled
+        print(
+            f"Quality gate toggled {'ON' if is_quality_gate_enabled else 'OFF'}"
+        )
+
     elif key_pressed == ord('w'):
         is_saving = not is_saving
         print(f"Saving toggled {'ON' if is_saving else 'OFF'}")
@@ -139,6 +215,7 @@ def handle_input(
     return (
         should_quit,
         roi_coordinates,
+        roi_quad,
         mode,
         simple_threshold,
         scale,
@@ -147,4 +224,5 @@ def handle_input(
         is_morphology_enabled,
         is_saving,
         save_interval,
+        is_quality_gate_enabled,
     )
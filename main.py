@@ -1,26 +1,89 @@
-import cv2
 import time
-import pytesseract
-import os
+
+# Taken before the heavy imports so startup metrics include them
+PROCESS_START_TIME = time.perf_counter()
+
+import cv2
+import numpy as np
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import config
-from image_processing import process_image
-from ocr import perform_ocr
+from image_processing import process_image, get_rectify_maps, rectify_roi
+from ocr import perform_ocr, setup_tesseract
 from excel_logging import initiate_excel, write_to_excel
 from ui_drawing import draw_overlays
 from input_handling import handle_input
+from quality_gate import (
+    REJECTION_REASONS, check_quality, thresholds_from_reference
+)
+
+
+# --- Warm-up ---
+WARM_UP_IMAGE_SHAPE = (48, 128, 3)
+WARM_UP_TEXT = "0.0"
+WARM_UP_TEXT_POS = (20, 36)
+WARM_UP_TEXT_SCALE = 1.0
+WARM_UP_TEXT_THICKNESS = 2
+
+
+def _make_warm_up_image() -> np.ndarray:
+    """Returns a small white image with dark digits, shaped like a real ROI."""
+    image = np.full(WARM_UP_IMAGE_SHAPE, 255, np.uint8)
+    cv2.putText(
+        image,
+        WARM_UP_TEXT,
+        WARM_UP_TEXT_POS,
+        cv2.FONT_HERSHEY_SIMPLEX,
+        WARM_UP_TEXT_SCALE,
+        (0, 0, 0),
+        WARM_UP_TEXT_THICKNESS,
+    )
+    return image
+
 
+def create_pipeline() -> cv2.CLAHE:
+    """Creates the CLAHE object and runs the processing pipeline once, so the 
+    first live frame doesn't pay OpenCV's one-time allocations.
 
-def setup_tesseract() -> None:
-    """Points pytesseract to Tesseract executable.
-    Especially important for aplications packaged with PyInstaller.
+    Returns:
+        cv2.CLAHE: The warmed-up CLAHE object for the main loop.
     """
-    if getattr(sys, 'frozen', False):
-        tesseract_path = os.path.join(
-            sys._MEIPASS, 'Tesseract-OCR', 'tesseract.exe'
-        )
-        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+    clahe = cv2.createCLAHE(
+        clipLimit=config.CLAHE_CLIP_LIMIT, 
+        tileGridSize=config.CLAHE_TILE_GRID_SIZE,
+    )
+    process_image(
+        _make_warm_up_image(),
+        config.DEFAULT_SCALE,
+        True,
+        clahe,
+        config.DEFAULT_MODE,
+        config.DEFAULT_SIMPLE_THRESHOLD,
+        config.IS_MORPHOLOGY_ENABLED,
+    )
+    return clahe
+
+
+def warm_up_ocr() -> None:
+    """Imports pytesseract and runs Tesseract once on a dummy image.
+
+    Loads the Tesseract executable and language model from disk ahead of the 
+    first live OCR call. setup_tesseract() must already have been called.
+    """
+    binary_image = cv2.threshold(
+        cv2.cvtColor(_make_warm_up_image(), cv2.COLOR_BGR2GRAY),
+        0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU,
+    )[1]
+    perform_ocr(binary_image, config.DEFAULT_PSM)
+
+
+def _log_warm_up_error(future: Future) -> None:
+    """Reports a failed background warm-up instead of dropping it silently."""
+    error = future.exception()
+    if error is not None:
+        print(f"[Warm-up Error]: {error}", file=sys.stderr)
 
 
 def main() -> None:
@@ -36,6 +99,12 @@ def main() -> None:
       - CLAHE: Contrast Limited Adaptive Histogram Equalization. An algorithm to improve image contrast.
       - FPS: Frames Per Second.
     
+    Startup: the OCR engine and processing pipeline are warmed up on 
+    background threads while the (often slow) camera opens. Time to first 
+    frame and time to first reading are measured from process start; time 
+    to first reading is also measured from each ROI selection, which 
+    excludes the operator's reaction time.
+    
     Raises:
         RuntimeError: If webcam specified by 'CAMERA_INDEX' in config.py
                       cannot be opened.
@@ -43,6 +112,12 @@ def main() -> None:
     setup_tesseract()
 
     # --- Initialization ---
+    warm_up_executor = ThreadPoolExecutor(max_workers=2)
+    pipeline_future = warm_up_executor.submit(create_pipeline)
+    ocr_warm_up_future = warm_up_executor.submit(warm_up_ocr)
+    ocr_warm_up_future.add_done_callback(_log_warm_up_error)
+    warm_up_executor.shutdown(wait=False)
+
     video_capture = cv2.VideoCapture(config.CAMERA_INDEX)
     if not video_capture.isOpened():
         raise RuntimeError(
@@ -52,12 +127,21 @@ def main() -> None:
 
     initiate_excel(config.EXCEL_FILENAME)
 
-    clahe = cv2.createCLAHE(
-        clipLimit=config.CLAHE_CLIP_LIMIT, 
-        tileGridSize=config.CLAHE_TILE_GRID_SIZE,
-    )
+    stream_server = None
+    if config.IS_STREAM_SERVER_ENABLED:
+        from streaming_server import start_streaming_server
+
+        stream_server = start_streaming_server(
+            config.STREAM_SERVER_HOST,
+            config.STREAM_SERVER_PORT,
+            config.STREAM_PREVIEW_FPS,
+            config.STREAM_PREVIEW_JPEG_QUALITY,
+        )
+
+    clahe = pipeline_future.result()
 
     roi_coordinates = None
+    roi_quad = None
     
     # --- Loop parameters ---
     mode = config.DEFAULT_MODE
@@ -68,31 +152,59 @@ def main() -> None:
     is_morphology_enabled = config.IS_MORPHOLOGY_ENABLED
     is_saving = config.IS_SAVING_ENABLED
     save_interval = config.DEFAULT_SAVE_INTERVAL_SECONDS
+    is_quality_gate_enabled = config.IS_QUALITY_GATE_ENABLED
+    quality_floor = (
+        config.QUALITY_MIN_SHARPNESS,
+        config.QUALITY_MAX_SATURATED_FRACTION,
+        config.QUALITY_MIN_CONTRAST,
+    )
+    quality_thresholds = quality_floor
+    # Metrics of the last accepted frames of the current ROI
+    quality_reference = deque(maxlen=config.QUALITY_REFERENCE_FRAMES)
     
     # --- OCR and FPS controls ---
     last_ocr_time = 0.0
     last_save_time = 0.0
     last_ocr_text = config.DEFAULT_LAST_OCR_TEXT
+    ocr_skipped_counts = dict.fromkeys(REJECTION_REASONS, 0)
+    consecutive_skips = 0
     fps = config.DEFAULT_FPS
     frame_count = config.DEFAULT_FRAME_COUNT
     fps_timer = time.time()
+    stage_timings_ms = {}
+    time_to_first_frame = None
+    time_to_first_reading = None
+    roi_selected_time = None
+    roi_to_first_reading = None
     
     # --- Main loop ---
     while True:
+        stage_start = time.perf_counter()
         is_frame_read, frame = video_capture.read()
         now = time.time()
+        stage_timings_ms["capture"] = (time.perf_counter() - stage_start) * 1000
         
         if not is_frame_read:
             print("Error: Could not read frame from camera.", file=sys.stderr)
             break
 
+        if time_to_first_frame is None:
+            time_to_first_frame = time.perf_counter() - PROCESS_START_TIME
+            print(f"Time to first frame: {time_to_first_frame:.2f}s")
+
         roi_cropped = None
         binary_image = None
         
         if roi_coordinates:
             x, y, w, h = roi_coordinates
             roi_cropped = frame[y : y + h, x : x + w]
-        
+            rectify_maps = (
+                get_rectify_maps(roi_quad, scale) if roi_quad else None
+            )
+            if stream_server:
+                stream_server.publish_preview(roi_cropped)
+
+            stage_start = time.perf_counter()
             binary_image = process_image(
                 roi_cropped,
                 scale,
@@ -101,18 +213,81 @@ def main() -> None:
                 mode,
                 simple_threshold,
                 is_morphology_enabled,
+                rectify_maps,
+            )
+            stage_timings_ms["process"] = (
+                (time.perf_counter() - stage_start) * 1000
             )
                 
             if binary_image is not None and \
             (now - last_ocr_time >= config.OCR_INTERVAL_SECONDS):
-                new_ocr_text, _ = perform_ocr(binary_image, psm)
+                rejection_reason = None
+                if is_quality_gate_enabled:
+                    stage_start = time.perf_counter()
+                    quality_thresholds = thresholds_from_reference(
+                        list(quality_reference),
+                        config.QUALITY_SHARPNESS_RATIO,
+                        config.QUALITY_CONTRAST_RATIO,
+                        config.QUALITY_SATURATION_MARGIN,
+                        quality_floor,
+                    )
+                    # Judge only the display, not the background of a tilted quad
+                    quality_image = (
+                        rectify_roi(roi_cropped, roi_quad)
+                        if roi_quad else roi_cropped
+                    )
+                    rejection_reason, quality_metrics = check_quality(
+                        quality_image, quality_thresholds
+                    )
+                    if rejection_reason is None:
+                        quality_reference.append(quality_metrics)
+                    stage_timings_ms["quality"] = (
+                        (time.perf_counter() - stage_start) * 1000
+                    )
+
+                if rejection_reason:
+                    ocr_skipped_counts[rejection_reason] += 1
+                    consecutive_skips += 1
+                    if consecutive_skips == config.QUALITY_WARN_CONSECUTIVE_SKIPS:
+                        print(
+                            f"Warning: OCR skipped {consecutive_skips} times in "
+                            f"a row ({rejection_reason}). Reselect the ROI "
+                            "with 's'/'r' or press 'g' to disable the gate.",
+                            file=sys.stderr,
+                        )
+                else:
+                    consecutive_skips = 0
+                    stage_start = time.perf_counter()
+                    new_ocr_text, _ = perform_ocr(binary_image, psm)
+                    stage_timings_ms["ocr"] = (
+                        (time.perf_counter() - stage_start) * 1000
+                    )
 
-                if new_ocr_text:
-                    last_ocr_text = new_ocr_text
+                    if new_ocr_text:
+                        last_ocr_text = new_ocr_text
+                        if time_to_first_reading is None:
+                            time_to_first_reading = (
+                                time.perf_counter() - PROCESS_START_TIME
+                            )
+                            print(
+                                "Time to first reading: "
+                                f"{time_to_first_reading:.2f}s"
+                            )
+                        if roi_to_first_reading is None and roi_selected_time:
+                            roi_to_first_reading = (
+                                time.perf_counter() - roi_selected_time
+                            )
+                            print(
+                                "Time from ROI selection to first reading: "
+                                f"{roi_to_first_reading:.2f}s"
+                            )
+                        if stream_server:
+                            stream_server.publish_reading(new_ocr_text, now)
                     
                 last_ocr_time = now
             
-            if is_saving and last_ocr_text and \
+            # Don't log a stale reading while the gate is rejecting frames
+            if is_saving and last_ocr_text and consecutive_skips == 0 and \
             (now - last_save_time) >= save_interval:
                 if write_to_excel(last_ocr_text, config.EXCEL_FILENAME):
                     last_save_time = now
@@ -124,9 +299,11 @@ def main() -> None:
             frame_count = 0
             fps_timer = now
             
+        stage_start = time.perf_counter()
         draw_overlays(
             frame,
             roi_coordinates,
+            roi_quad,
             roi_cropped,
             binary_image,
             last_ocr_text,
@@ -138,14 +315,43 @@ def main() -> None:
             fps,
             is_saving,
             save_interval,
+            is_quality_gate_enabled,
+            sum(ocr_skipped_counts.values()),
         )
 
         cv2.imshow("Webcam OCR - Live", frame)
+        stage_timings_ms["display"] = (time.perf_counter() - stage_start) * 1000
+
+        if stream_server:
+            stream_server.update_state({
+                "last_ocr_text": last_ocr_text,
+                "last_ocr_time": last_ocr_time,
+                "roi": roi_coordinates,
+                "roi_quad": roi_quad,
+                "mode": mode,
+                "psm": psm,
+                "scale": scale,
+                "simple_threshold": simple_threshold,
+                "is_clahe_enabled": is_clahe_enabled,
+                "is_morphology_enabled": is_morphology_enabled,
+                "is_saving": is_saving,
+                "save_interval": save_interval,
+                "is_quality_gate_enabled": is_quality_gate_enabled,
+                "ocr_skipped_counts": dict(ocr_skipped_counts),
+                "quality_thresholds": quality_thresholds,
+                "fps": fps,
+                "stage_timings_ms": dict(stage_timings_ms),
+                "time_to_first_frame_s": time_to_first_frame,
+                "time_to_first_reading_s": time_to_first_reading,
+                "roi_to_first_reading_s": roi_to_first_reading,
+            })
         
         key_pressed = cv2.waitKey(1) & 0xFF
+        previous_roi = (roi_coordinates, roi_quad)
         (
             should_quit,
             roi_coordinates,
+            roi_quad,
             mode,
             simple_threshold,
             scale,
@@ -154,10 +360,12 @@ def main() -> None:
             is_morphology_enabled,
             is_saving,
             save_interval,
+            is_quality_gate_enabled,
         ) = handle_input(
             key_pressed,
             frame,
             roi_coordinates,
+            roi_quad,
             mode,
             simple_threshold,
             scale,
@@ -166,13 +374,24 @@ def main() -> None:
             is_morphology_enabled,
             is_saving,
             save_interval,
+            is_quality_gate_enabled,
         )
 
+        if (roi_coordinates, roi_quad) != previous_roi:
+            roi_selected_time = time.perf_counter()
+            roi_to_first_reading = None
+            quality_thresholds = quality_floor
+            quality_reference.clear()
+            consecutive_skips = 0
+
         if should_quit:
             break
     
     # --- Cleanup ---
     print("Closing application...")
+    print(f"OCR calls skipped by quality gate: {ocr_skipped_counts}")
+    if stream_server:
+        stream_server.stop()
     video_capture.release()
     cv2.destroyAllWindows()
 
@@ -1,5 +1,5 @@
 import cv2
-import pytesseract
+import os
 import re
 import numpy as np
 import sys
@@ -12,6 +12,19 @@ TESSERACT_BASE_CONFIG = r'--oem 1 -c tessedit_char_whitelist=0123456789.-, \
 INVERT_THRESHOLD = 127.0
     
 
+def setup_tesseract() -> None:
+    """Points pytesseract to Tesseract executable.
+    Especially important for aplications packaged with PyInstaller.
+    """
+    if getattr(sys, 'frozen', False):
+        import pytesseract
+
+        tesseract_path = os.path.join(
+            sys._MEIPASS, 'Tesseract-OCR', 'tesseract.exe'
+        )
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+
 def extract_number(text: str | None) -> str | None:
     """Uses regex to find the first valid number in a string.
     
@@ -46,6 +59,9 @@ def perform_ocr(image: np.ndarray | None, psm: int) -> tuple[str | None, str | N
     """
     if image is None:
         return None, None
+
+    # Imported on first use so startup doesn't wait for pytesseract/PIL
+    import pytesseract
     
     if image.mean() < INVERT_THRESHOLD:
         image = cv2.bitwise_not(image)
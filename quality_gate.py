@@ -0,0 +1,138 @@
+import cv2
+import numpy as np
+
+
+# --- Constants ---
+SATURATION_LEVEL = 250  # Gray level counted as blown out by glare
+EDGE_PERCENTILE = 99  # Steepest edges only, so the share of ink doesn't matter
+RANGE_PERCENTILES = (1, 99)  # Dark/bright levels, robust to hot pixels
+SOBEL_GAIN = 8.0  # 3x3 Sobel response to a one-level-per-pixel ramp
+
+# --- Rejection Reasons ---
+REASON_BLUR = "blur"
+REASON_GLARE = "glare"
+REASON_LOW_CONTRAST = "low_contrast"
+REASON_EMPTY_ROI = "empty_roi"  # Crop has no pixels, the ROI is misplaced
+REJECTION_REASONS = (
+    REASON_BLUR, REASON_GLARE, REASON_LOW_CONTRAST, REASON_EMPTY_ROI
+)
+
+# --- Type Aliases ---
+# (sharpness, saturated_fraction, contrast)
+QualityMetrics = tuple[float, float, float]
+# (min_sharpness, max_saturated_fraction, min_contrast)
+QualityThresholds = tuple[float, float, float]
+
+
+def measure_quality(image: np.ndarray) -> QualityMetrics | None:
+    """Computes cheap quality statistics on the raw (unscaled) ROI image.
+
+    Sharpness and contrast are taken from percentiles rather than sums or
+    variances, so they describe how crisp and how dark/bright the digits
+    are, not how many segments happen to be lit ("888.8" and "111.1" score
+    the same).
+
+    Args:
+        image (np.ndarray): The raw BGR ROI image.
+
+    Returns:
+        QualityMetrics | None:
+            - Sharpness: steepest edge slope as a share of the intensity
+              range per pixel (about 0.35 for a crisp edge, lower the wider
+              the edge is smeared by motion/focus blur).
+            - Saturated fraction: share of pixels at or above SATURATION_LEVEL.
+            - Contrast: gray-level range between the dark and bright
+              percentiles (low = blank or covered ROI).
+        None if the image is empty.
+    """
+    if image is None or image.size == 0:
+        return None
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    dark_level, bright_level = np.percentile(gray, RANGE_PERCENTILES)
+    contrast = float(bright_level - dark_level)
+
+    # Light smoothing keeps sensor noise from posing as sharp edges
+    smoothed = cv2.GaussianBlur(gray, (3, 3), 0)
+    gradient = cv2.magnitude(
+        cv2.Sobel(smoothed, cv2.CV_32F, 1, 0),
+        cv2.Sobel(smoothed, cv2.CV_32F, 0, 1),
+    )
+    edge_slope = float(np.percentile(gradient, EDGE_PERCENTILE)) / SOBEL_GAIN
+    saturated_fraction = np.count_nonzero(gray >= SATURATION_LEVEL) / gray.size
+
+    return (
+        edge_slope / max(contrast, 1.0),
+        float(saturated_fraction),
+        contrast,
+    )
+
+
+def check_quality(
+    image: np.ndarray, thresholds: QualityThresholds
+) -> tuple[str | None, QualityMetrics | None]:
+    """Decides whether an ROI image is worth sending to OCR.
+
+    Args:
+        image (np.ndarray): The raw BGR ROI image.
+        thresholds (QualityThresholds): Limits for this ROI.
+
+    Returns:
+        tuple[str | None, QualityMetrics | None]: One of REJECTION_REASONS if
+        OCR should be skipped (None if the frame looks usable), and the
+        measured metrics (None for an empty image).
+    """
+    metrics = measure_quality(image)
+    if metrics is None:
+        return REASON_EMPTY_ROI, None
+
+    sharpness, saturated_fraction, contrast = metrics
+    min_sharpness, max_saturated_fraction, min_contrast = thresholds
+
+    if contrast < min_contrast:
+        return REASON_LOW_CONTRAST, metrics
+    if saturated_fraction > max_saturated_fraction:
+        return REASON_GLARE, metrics
+    if sharpness < min_sharpness:
+        return REASON_BLUR, metrics
+    return None, metrics
+
+
+def thresholds_from_reference(
+    reference: list[QualityMetrics],
+    sharpness_ratio: float,
+    contrast_ratio: float,
+    saturation_margin: float,
+    floor: QualityThresholds,
+) -> QualityThresholds:
+    """Derives thresholds for one ROI from its recently accepted frames.
+
+    The reference is the median of the given metrics, so a single blurred or
+    glared frame can't loosen the limits, and slow changes in lighting are
+    followed. The absolute 'floor' limits always apply and are used alone
+    until the reference has frames.
+
+    Args:
+        reference (list[QualityMetrics]): Metrics of the last accepted frames
+        of this ROI (may be empty).
+        sharpness_ratio (float): Share of the reference sharpness below
+        which a frame counts as blurred.
+        contrast_ratio (float): Share of the reference contrast below which
+        a frame counts as blank or covered.
+        saturation_margin (float): Extra blown-out share allowed on top of
+        the reference.
+        floor (QualityThresholds): Absolute limits, never loosened.
+
+    Returns:
+        QualityThresholds: Thresholds for the next frame.
+    """
+    if not reference:
+        return floor
+
+    sharpness, saturated_fraction, contrast = np.median(reference, axis=0)
+    min_sharpness, max_saturated_fraction, min_contrast = floor
+    return (
+        max(min_sharpness, float(sharpness) * sharpness_ratio),
+        min(max_saturated_fraction, float(saturated_fraction) + saturation_margin),
+        max(min_contrast, float(contrast) * contrast_ratio),
+    )
@@ -0,0 +1,299 @@
+"""Embedded localhost server that streams readings and a preview to other tools.
+
+Endpoints:
+  - /state    JSON snapshot of the current settings, last reading and stage
+              timings.
+  - /events   Server-Sent Events stream, one 'reading' event per accepted OCR
+              value.
+  - /preview  MJPEG stream of the raw ROI at a throttled rate.
+
+Everything runs on daemon threads, so the capture loop only ever stores a
+reference or makes one ROI copy per preview interval. Each payload (event
+line, JPEG) is encoded once and the same bytes object is written to every
+client.
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import cv2
+import numpy as np
+
+
+# --- Constants ---
+HISTORY_SIZE = 64  # Readings a slow SSE client can fall behind before skipping
+CLIENT_WAIT_TIMEOUT_SECONDS = 1.0
+SSE_KEEPALIVE = b": keepalive\n\n"
+MJPEG_BOUNDARY = "frame"
+JSON_CONTENT_TYPE = "application/json"
+
+
+class Broadcast:
+    """Single-producer, many-consumer channel with sequence numbers.
+
+    Published payloads are kept in a short ring buffer so consumers can pick
+    up everything newer than the last sequence number they saw. Payloads are
+    shared between consumers, never copied.
+    """
+
+    def __init__(self, history_size: int = 1) -> None:
+        self._condition = threading.Condition()
+        self._history: deque[tuple[int, bytes]] = deque(maxlen=history_size)
+        self._sequence = 0
+        self._is_closed = False
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the most recently published payload."""
+        return self._sequence
+
+    @property
+    def is_closed(self) -> bool:
+        """True once close() has been called."""
+        return self._is_closed
+
+    def publish(self, payload: bytes) -> None:
+        """Stores a payload and wakes all waiting consumers."""
+        with self._condition:
+            self._sequence += 1
+            self._history.append((self._sequence, payload))
+            self._condition.notify_all()
+
+    def wait_newer(
+        self, last_sequence: int, timeout: float
+    ) -> list[tuple[int, bytes]] | None:
+        """Blocks until payloads newer than 'last_sequence' exist.
+
+        Args:
+            last_sequence (int): Sequence number the consumer has already seen.
+            timeout (float): Maximum time to wait, in seconds.
+
+        Returns:
+            list[tuple[int, bytes]] | None: New (sequence, payload) pairs
+            (empty on timeout), or None once the channel is closed.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._is_closed or self._sequence > last_sequence,
+                timeout,
+            )
+            if self._is_closed:
+                return None
+            return [item for item in self._history if item[0] > last_sequence]
+
+    def close(self) -> None:
+        """Releases all waiting consumers."""
+        with self._condition:
+            self._is_closed = True
+            self._condition.notify_all()
+
+
+class StreamingServer:
+    """Owns the HTTP server thread and the channels it serves from.
+
+    Args:
+        host (str): Interface to bind, normally "127.0.0.1".
+        port (int): TCP port to listen on.
+        preview_fps (float): Maximum MJPEG preview rate.
+        jpeg_quality (int): Preview JPEG quality (0-100).
+    """
+
+    def __init__(
+        self, host: str, port: int, preview_fps: float, jpeg_quality: int
+    ) -> None:
+        self.readings = Broadcast(HISTORY_SIZE)
+        self.preview = Broadcast()
+        self.preview_subscribers = 0
+        self._preview_interval = 1.0 / preview_fps
+        self._jpeg_parameters = [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
+        self._last_preview_time = 0.0
+        self._pending_preview: np.ndarray | None = None
+        self._preview_ready = threading.Event()
+        self._state: dict = {}
+        self._lock = threading.Lock()
+
+        self._http_server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._http_server.daemon_threads = True
+        self._http_server.streaming = self
+        self._threads = [
+            threading.Thread(target=self._http_server.serve_forever, daemon=True),
+            threading.Thread(target=self._encode_previews, daemon=True),
+        ]
+
+    def start(self) -> None:
+        """Starts serving in the background."""
+        for thread in self._threads:
+            thread.start()
+        host, port = self._http_server.server_address[:2]
+        print(f"Streaming server listening on http://{host}:{port}")
+
+    def stop(self) -> None:
+        """Disconnects all clients and stops the server threads."""
+        self.readings.close()
+        self.preview.close()
+        self._preview_ready.set()
+        self._http_server.shutdown()
+        self._http_server.server_close()
+
+    def update_state(self, state: dict) -> None:
+        """Replaces the /state snapshot. Serialization happens per request, so
+        this only swaps a reference."""
+        self._state = state
+
+    def get_state_json(self) -> bytes:
+        """Serializes the current state snapshot for /state."""
+        state = dict(self._state)
+        state["sse_sequence"] = self.readings.sequence
+        state["preview_subscribers"] = self.preview_subscribers
+        return json.dumps(state).encode()
+
+    def publish_reading(self, value: str, timestamp: float) -> None:
+        """Pushes one accepted OCR reading to all /events subscribers."""
+        payload = json.dumps({"value": value, "timestamp": timestamp})
+        self.readings.publish(f"event: reading\ndata: {payload}\n\n".encode())
+
+    def publish_preview(self, image: np.ndarray | None) -> None:
+        """Offers a new ROI image for the MJPEG preview.
+
+        Returns immediately unless a client is watching and the preview
+        interval has elapsed; only then is the image copied and handed to the
+        encoder thread.
+        """
+        if image is None or self.preview_subscribers == 0:
+            return
+        now = time.monotonic()
+        if now - self._last_preview_time < self._preview_interval:
+            return
+        self._last_preview_time = now
+        self._pending_preview = image.copy()
+        self._preview_ready.set()
+
+    def add_preview_subscriber(self, delta: int) -> None:
+        """Tracks the number of open /preview connections."""
+        with self._lock:
+            self.preview_subscribers += delta
+
+    def _encode_previews(self) -> None:
+        """Encoder thread: turns pending ROI images into shared MJPEG parts."""
+        while not self.preview.is_closed:
+            self._preview_ready.wait()
+            self._preview_ready.clear()
+            image, self._pending_preview = self._pending_preview, None
+            if image is None:
+                continue
+            is_encoded, jpeg = cv2.imencode(".jpg", image, self._jpeg_parameters)
+            if not is_encoded:
+                continue
+            header = (
+                f"--{MJPEG_BOUNDARY}\r\n"
+                f"Content-Type: image/jpeg\r\n"
+                f"Content-Length: {len(jpeg)}\r\n\r\n"
+            ).encode()
+            self.preview.publish(header + jpeg.tobytes() + b"\r\n")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """Routes requests to the StreamingServer attached to the HTTP server."""
+
+    def do_GET(self) -> None:
+        streaming: StreamingServer = self.server.streaming
+        # Ignore query strings such as the cache-buster in '/preview?t=123'
+        path = urlsplit(self.path).path
+        try:
+            if path == "/state":
+                self._send_state(streaming)
+            elif path == "/events":
+                self._stream_events(streaming)
+            elif path == "/preview":
+                self._stream_preview(streaming)
+            else:
+                self.send_error(404)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format: str, *args) -> None:
+        """Keeps per-request logging out of the console."""
+        pass
+
+    def _send_state(self, streaming: StreamingServer) -> None:
+        body = streaming.get_state_json()
+        self.send_response(200)
+        self.send_header("Content-Type", JSON_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, streaming: StreamingServer) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        last_sequence = streaming.readings.sequence
+        while True:
+            items = streaming.readings.wait_newer(
+                last_sequence, CLIENT_WAIT_TIMEOUT_SECONDS
+            )
+            if items is None:
+                return
+            if not items:
+                self.wfile.write(SSE_KEEPALIVE)
+            for last_sequence, payload in items:
+                self.wfile.write(payload)
+            self.wfile.flush()
+
+    def _stream_preview(self, streaming: StreamingServer) -> None:
+        self.send_response(200)
+        self.send_header(
+            "Content-Type",
+            f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}",
+        )
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        streaming.add_preview_subscriber(1)
+        try:
+            last_sequence = 0
+            while True:
+                items = streaming.preview.wait_newer(
+                    last_sequence, CLIENT_WAIT_TIMEOUT_SECONDS
+                )
+                if items is None:
+                    return
+                if items:
+                    last_sequence, payload = items[-1]
+                    self.wfile.write(payload)
+                    self.wfile.flush()
+        finally:
+            streaming.add_preview_subscriber(-1)
+
+
+def start_streaming_server(
+    host: str, port: int, preview_fps: float, jpeg_quality: int
+) -> StreamingServer | None:
+    """Creates and starts the streaming server.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): TCP port to listen on.
+        preview_fps (float): Maximum MJPEG preview rate.
+        jpeg_quality (int): Preview JPEG quality (0-100).
+
+    Returns:
+        StreamingServer | None: The running server, or None if the port could
+        not be bound (the application keeps running without it).
+    """
+    try:
+        server = StreamingServer(host, port, preview_fps, jpeg_quality)
+    except OSError as e:
+        print(
+            f"ERROR: Could not start streaming server on {host}:{port}: {e}",
+            file=sys.stderr,
+        )
+        return None
+    server.start()
+    return server
@@ -0,0 +1,251 @@
+"""Synthetic numeric readouts with known ground truth.
+
+Renders numbers the way a camera would see an instrument display (Hershey
+fonts or seven-segment digits, then skew, blur, noise and reduced contrast)
+using only OpenCV drawing, so performance and accuracy work doesn't need
+customer footage.
+
+Example:
+    python synthetic_digits.py --count 20 --output-dir synthetic
+"""
+
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+
+# --- Fonts ---
+SEVEN_SEGMENT = -1  # Pseudo font id for the seven-segment renderer
+FONTS = (
+    cv2.FONT_HERSHEY_SIMPLEX,
+    cv2.FONT_HERSHEY_DUPLEX,
+    cv2.FONT_HERSHEY_PLAIN,
+    cv2.FONT_HERSHEY_COMPLEX,
+    SEVEN_SEGMENT,
+)
+
+# --- Text Layout ---
+TEXT_HEIGHT = 48  # Digit height in pixels before degradation
+TEXT_MARGIN = 16
+TEXT_THICKNESS = 3
+
+# --- Seven-Segment Geometry (fractions of the digit height) ---
+SEGMENT_WIDTH_RATIO = 0.55
+SEGMENT_THICKNESS_RATIO = 0.12
+SEGMENT_GAP_RATIO = 0.18
+DOT_SIZE_RATIO = 0.14
+
+# Segments per character: a=top, b=top right, c=bottom right, d=bottom,
+# e=bottom left, f=top left, g=middle
+SEGMENTS = {
+    "0": "abcdef",
+    "1": "bc",
+    "2": "abdeg",
+    "3": "abcdg",
+    "4": "bcfg",
+    "5": "acdfg",
+    "6": "acdefg",
+    "7": "abc",
+    "8": "abcdefg",
+    "9": "abcdfg",
+    "-": "g",
+}
+
+# --- Degradation Defaults ---
+BACKGROUND_LEVEL = 200
+MAX_INK_DEPTH = 180  # Background-to-ink difference at full contrast
+
+# --- Type Aliases ---
+# (font, skew_degrees, blur_sigma, noise_sigma, contrast, is_inverted)
+ReadoutStyle = tuple[int, float, float, float, float, bool]
+
+
+def random_number_text(rng: np.random.Generator) -> str:
+    """Returns a random reading such as '7', '-12.5' or '0.034'."""
+    integer_digits = int(rng.integers(1, 5))
+    decimal_digits = int(rng.integers(0, 4))
+    text = str(int(rng.integers(0, 10 ** integer_digits)))
+    if decimal_digits:
+        text += "." + "".join(
+            str(digit) for digit in rng.integers(0, 10, decimal_digits)
+        )
+    if rng.random() < 0.2:
+        text = "-" + text
+    return text
+
+
+def _draw_seven_segment(
+    canvas: np.ndarray, text: str, origin: tuple[int, int], color: int
+) -> None:
+    """Draws 'text' as seven-segment digits with the bottom-left at 'origin'."""
+    height = TEXT_HEIGHT
+    width = int(height * SEGMENT_WIDTH_RATIO)
+    thickness = max(1, int(height * SEGMENT_THICKNESS_RATIO))
+    gap = int(height * SEGMENT_GAP_RATIO)
+    dot = max(1, int(height * DOT_SIZE_RATIO))
+    half = height // 2
+
+    x, bottom = origin
+    top = bottom - height
+    for character in text:
+        if character in ".,":
+            cv2.rectangle(
+                canvas, (x, bottom - dot), (x + dot, bottom), color, -1
+            )
+            x += dot + gap // 2
+            continue
+
+        segment_boxes = {
+            "a": ((x, top), (x + width, top + thickness)),
+            "b": ((x + width - thickness, top), (x + width, top + half)),
+            "c": ((x + width - thickness, top + half), (x + width, bottom)),
+            "d": ((x, bottom - thickness), (x + width, bottom)),
+            "e": ((x, top + half), (x + thickness, bottom)),
+            "f": ((x, top), (x + thickness, top + half)),
+            "g": (
+                (x, top + half - thickness // 2),
+                (x + width, top + half + thickness // 2),
+            ),
+        }
+        for segment in SEGMENTS.get(character, ""):
+            corner_a, corner_b = segment_boxes[segment]
+            cv2.rectangle(canvas, corner_a, corner_b, color, -1)
+        x += width + gap
+
+
+def _seven_segment_width(text: str) -> int:
+    """Returns the rendered width of 'text' in the seven-segment style."""
+    width = int(TEXT_HEIGHT * SEGMENT_WIDTH_RATIO)
+    gap = int(TEXT_HEIGHT * SEGMENT_GAP_RATIO)
+    dot = max(1, int(TEXT_HEIGHT * DOT_SIZE_RATIO))
+    return sum(
+        dot + gap // 2 if character in ".," else width + gap
+        for character in text
+    )
+
+
+def render_readout(
+    text: str,
+    style: ReadoutStyle,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """Renders a number as a camera-like BGR ROI crop.
+
+    Args:
+        text (str): The ground-truth reading to draw.
+        style (ReadoutStyle): (font, skew_degrees, blur_sigma, noise_sigma,
+        contrast, is_inverted). 'font' is a cv2.FONT_HERSHEY_* value or
+        SEVEN_SEGMENT, 'contrast' is in (0, 1] and 'is_inverted' draws bright
+        digits on a dark background (LED style).
+        rng (np.random.Generator | None): Noise source. Defaults to a fixed
+        seed, so equal inputs give equal images.
+
+    Returns:
+        np.ndarray: BGR image of the readout.
+    """
+    font, skew_degrees, blur_sigma, noise_sigma, contrast, is_inverted = style
+    rng = rng if rng is not None else np.random.default_rng(0)
+
+    if font == SEVEN_SEGMENT:
+        text_width = _seven_segment_width(text)
+    else:
+        font_scale = cv2.getFontScaleFromHeight(font, TEXT_HEIGHT, TEXT_THICKNESS)
+        (text_width, _), _ = cv2.getTextSize(
+            text, font, font_scale, TEXT_THICKNESS
+        )
+
+    ink_depth = int(MAX_INK_DEPTH * contrast)
+    canvas = np.full(
+        (TEXT_HEIGHT + 2 * TEXT_MARGIN, text_width + 2 * TEXT_MARGIN),
+        BACKGROUND_LEVEL,
+        np.uint8,
+    )
+    origin = (TEXT_MARGIN, TEXT_MARGIN + TEXT_HEIGHT)
+    ink = BACKGROUND_LEVEL - ink_depth
+    if font == SEVEN_SEGMENT:
+        _draw_seven_segment(canvas, text, origin, ink)
+    else:
+        cv2.putText(
+            canvas, text, origin, font, font_scale, ink, TEXT_THICKNESS,
+            cv2.LINE_AA,
+        )
+
+    if skew_degrees:
+        height, width = canvas.shape
+        shear = np.tan(np.radians(skew_degrees))
+        # Shear around the vertical center, as seen when a panel is tilted
+        transform = np.float32([[1, -shear, shear * height / 2], [0, 1, 0]])
+        canvas = cv2.warpAffine(
+            canvas, transform, (width, height), borderMode=cv2.BORDER_REPLICATE
+        )
+    if blur_sigma > 0:
+        canvas = cv2.GaussianBlur(canvas, (0, 0), blur_sigma)
+    if noise_sigma > 0:
+        noise = rng.normal(0.0, noise_sigma, canvas.shape)
+        canvas = np.clip(canvas + noise, 0, 255).astype(np.uint8)
+    if is_inverted:
+        canvas = cv2.bitwise_not(canvas)
+
+    return cv2.cvtColor(canvas, cv2.COLOR_GRAY2BGR)
+
+
+def random_style(rng: np.random.Generator) -> ReadoutStyle:
+    """Draws a random but realistic degradation style."""
+    return (
+        int(rng.choice(FONTS)),
+        float(rng.uniform(-12.0, 12.0)),
+        float(rng.choice([0.0, 0.6, 1.2, 2.0])),
+        float(rng.uniform(0.0, 12.0)),
+        float(rng.uniform(0.35, 1.0)),
+        bool(rng.random() < 0.25),
+    )
+
+
+def generate_dataset(
+    count: int, seed: int = 0
+) -> list[tuple[np.ndarray, str, ReadoutStyle]]:
+    """Generates a reproducible set of (image, ground truth, style) samples.
+
+    Args:
+        count (int): Number of samples.
+        seed (int): Random seed; the same seed gives the same dataset.
+
+    Returns:
+        list[tuple[np.ndarray, str, ReadoutStyle]]: Rendered samples.
+    """
+    rng = np.random.default_rng(seed)
+    samples = []
+    for _ in range(count):
+        text = random_number_text(rng)
+        style = random_style(rng)
+        samples.append((render_readout(text, style, rng), text, style))
+    return samples
+
+
+def main() -> None:
+    """Writes a synthetic dataset to disk as PNG files plus a labels CSV."""
+    parser = argparse.ArgumentParser(
+        description="Render synthetic numeric readouts with ground truth."
+    )
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output-dir", default="synthetic_digits")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    labels_path = os.path.join(args.output_dir, "labels.csv")
+    with open(labels_path, "w", encoding="utf-8") as labels_file:
+        labels_file.write("file,text\n")
+        for index, (image, text, _) in enumerate(
+            generate_dataset(args.count, args.seed)
+        ):
+            file_name = f"readout_{index:04d}.png"
+            cv2.imwrite(os.path.join(args.output_dir, file_name), image)
+            labels_file.write(f"{file_name},{text}\n")
+    print(f"Wrote {args.count} readouts to '{args.output_dir}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
 import cv2
 import numpy as np
+import time
+from functools import lru_cache
+
+import config
 
 
 # --- Styling ---
@@ -23,6 +27,60 @@ OCR_LABEL_OFFSET_Y = -10
 OCR_LABEL_MIN_Y = 30
 DEBUG_LABEL_POS = (10, 28)
 
+# --- Sprite Cache ---
+LABEL_CACHE_SIZE = 64  # HUD/OCR strings only change on state changes
+
+# --- Debug Window State ---
+# A rate of 0 or less refreshes the debug windows on every frame
+DEBUG_WINDOW_INTERVAL_SECONDS = (
+    1.0 / config.DEBUG_WINDOW_FPS if config.DEBUG_WINDOW_FPS > 0 else 0.0
+)
+_last_debug_refresh_time = 0.0
+
+
+@lru_cache(maxsize=LABEL_CACHE_SIZE)
+def _render_label(
+    text: str,
+    font: int,
+    scale: float,
+    color: tuple[int, int, int],
+    thick: int,
+) -> tuple[np.ndarray, int, int]:
+    """Renders a label (black box + text) once into a small BGR sprite.
+
+    Args:
+        text (str): Text content to draw.
+        font (int): OpenCV font type.
+        scale (float): Font scale.
+        color (tuple[int, int, int]): BGR text color.
+        thick (int): Text thickness.
+
+    Returns:
+        tuple[np.ndarray, int, int]: The sprite and the (x, y) offset of its 
+        top-left corner relative to the text origin.
+    """
+    (text_width, text_height), baseline = cv2.getTextSize(text, font, scale, thick)
+    sprite = np.full(
+        (
+            text_height + baseline + 2 * LABEL_BG_PADDING + 1,
+            text_width + 2 * LABEL_BG_PADDING + 1,
+            3,
+        ),
+        COLOR_BLACK,
+        np.uint8,
+    )
+    cv2.putText(
+        sprite,
+        text,
+        (LABEL_BG_PADDING, text_height + LABEL_BG_PADDING),
+        font,
+        scale,
+        color,
+        thick,
+        cv2.LINE_AA,
+    )
+    return sprite, -LABEL_BG_PADDING, -text_height - LABEL_BG_PADDING
+
 
 def draw_label(
         img: np.ndarray,
@@ -35,6 +93,9 @@ def draw_label(
 ) -> None:
     """Draws a high-contrast label: a filled black rectangle with the text on top.
 
+    The label is rendered once per distinct text/style and then copied onto 
+    the image, so unchanged labels cost only a small array copy per frame.
+
     Args:
         img (np.ndarray): Image to draw on (modified in-place).
         text (str): Text content to draw.
@@ -46,16 +107,18 @@ def draw_label(
         COLOR_YELLOW.
         thick (int, optional): Text thickness. Defaults to LABEL_THICKNESS.
     """
-    (text_width, text_height), baseline = cv2.getTextSize(text, font, scale, thick)
-    x, y = position
-    cv2.rectangle(
-        img,
-        (x - LABEL_BG_PADDING, y - text_height - LABEL_BG_PADDING),
-        (x + text_width + LABEL_BG_PADDING, y + baseline + LABEL_BG_PADDING),
-        COLOR_BLACK,
-        -1
-    )
-    cv2.putText(img, text, (x, y), font, scale, color, thick, cv2.LINE_AA)
+    sprite, offset_x, offset_y = _render_label(text, font, scale, color, thick)
+    left = position[0] + offset_x
+    top = position[1] + offset_y
+
+    # Clip the sprite to the image, like cv2.rectangle/putText would
+    img_height, img_width = img.shape[:2]
+    x0, y0 = max(left, 0), max(top, 0)
+    x1 = min(left + sprite.shape[1], img_width)
+    y1 = min(top + sprite.shape[0], img_height)
+    if x0 >= x1 or y0 >= y1:
+        return
+    img[y0:y1, x0:x1] = sprite[y0 - top : y1 - top, x0 - left : x1 - left]
 
 
 def _show_debug_windows(
@@ -65,11 +128,22 @@ def _show_debug_windows(
 ) -> None:
     """Handles the creation and drawing for the two debug windows.
 
+    Windows are refreshed at most DEBUG_WINDOW_FPS times per second (every 
+    frame if it is 0 or less), which also skips the gray-to-BGR conversion 
+    on the frames in between.
+
     Args:
         roi_cropped (np.ndarray | None): Raw cropped image from the main frame.
         binary_image (np.ndarray | None): Final preprocessed binary image.
         last_ocr_text (str): Most recent valid OCR text to display.
     """
+    global _last_debug_refresh_time
+
+    now = time.monotonic()
+    if now - _last_debug_refresh_time < DEBUG_WINDOW_INTERVAL_SECONDS:
+        return
+    _last_debug_refresh_time = now
+
     if roi_cropped is not None:
         cv2.imshow("Webcam OCR - ROI", roi_cropped)
     if binary_image is not None:
@@ -85,6 +159,7 @@ def _show_debug_windows(
 def draw_overlays(
     frame: np.ndarray,
     roi_coordinates: tuple[int, int, int, int] | None,
+    roi_quad: tuple[tuple[int, int], ...] | None,
     roi_cropped: np.ndarray | None,
     binary_image: np.ndarray | None,
     last_ocr_text: str,
@@ -96,6 +171,8 @@ def draw_overlays(
     fps: float,
     is_saving: bool,
     save_interval: float,
+    is_quality_gate_enabled: bool,
+    ocr_skipped_count: int,
 ) -> None:
     """Draws all text, rectangles and debug windows on the main frame.
 
@@ -103,6 +180,8 @@ def draw_overlays(
         frame (np.ndarray): Main camera frame to be modified in-place.
         roi_coordinates (tuple[int, int, int, int] | None): (x, y, w, h) of 
         the selected ROI.
+        roi_quad (tuple[tuple[int, int], ...] | None): Corner points of a 
+        perspective ROI, drawn instead of the box when set.
         roi_cropped (np.ndarray | None): Raw cropped image from the main 
         frame.
         binary_image (np.ndarray | None): Final preprocessed binary image.
@@ -115,12 +194,19 @@ def draw_overlays(
         fps (float): Current calculated FPS.
         is_saving (bool): Flag if saving to Excel is active.
         save_interval (float): Current save interval in seconds.
+        is_quality_gate_enabled (bool): Flag if the quality gate is active.
+        ocr_skipped_count (int): OCR calls skipped by the quality gate so far.
     """
     frame_height = frame.shape[0]
     
     if roi_coordinates:
         x, y, w, h = roi_coordinates
-        cv2.rectangle(frame, (x, y), (x + w, y + h), COLOR_GREEN_BRIGHT, 2)
+        if roi_quad:
+            cv2.polylines(
+                frame, [np.array(roi_quad, np.int32)], True, COLOR_GREEN_BRIGHT, 2
+            )
+        else:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), COLOR_GREEN_BRIGHT, 2)
         
         ocr_label_y = max(OCR_LABEL_MIN_Y, y + OCR_LABEL_OFFSET_Y)
         draw_label(frame, f"OCR: {last_ocr_text or '(empty)'}", (x, ocr_label_y))
@@ -138,6 +224,7 @@ def draw_overlays(
     
     save_status = f"SAVING ({save_interval}s)" if is_saving else "IDLE"
     save_color = COLOR_YELLOW if is_saving else COLOR_GREEN_MUTED
+    gate_status = f"on({ocr_skipped_count})" if is_quality_gate_enabled else "off"
     
     hud = (
         f"Mode:{mode} "
@@ -145,6 +232,7 @@ def draw_overlays(
         f"Thr:{simple_threshold if mode==5 else '-'} "
         f"CLAHE:{'on' if is_clahe_enabled else 'off'} "
         f"Morph:{'on' if is_morphology_enabled else 'off'} "
+        f"Gate:{gate_status} "
         f"FPS:{fps:.1f} | {save_status}"
     )
 